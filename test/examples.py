@@ -77,7 +77,8 @@ INIT_CASES: t.Dict[str, t.Tuple[tuple, dict]] = {
     '1.0.0.rc3': ((1, 0, 0, ('.', 'rc', 3)), {}),
     '1.0.0.rc2+local': ((1, 0, 0, '.', 'rc', 2, 'local'), {}),
     '1.0.0.rc3+local': ((1, 0, 0, ('.', 'rc', 3), 'local'), {}),
-    '1.0.0.rc4+local': ((1, 0, 0, ('.', 'rc', 4), ('local',)), {})}
+    '1.0.0.rc4+local': ((1, 0, 0, ('.', 'rc', 4), ('local',)), {}),
+    '1.0.0.dev1': ((1, 0, 0), {'pre_release': (('.', 'dev', 1),)})}
 
 BAD_INIT_CASES: t.Dict[t.Tuple[tuple, tuple], t.Type[Exception]] = {
     (('spam',), ()): TypeError,
@@ -126,6 +127,7 @@ COMPATIBLE_STR_CASES = {
     '0.54.0': ((0, 54, 0), {}),
     '1.0.0': ((1, 0, 0), {}),
     '7.0.42+1d7b090a': ((7, 0, 42), {'local': '1d7b090a'}),
+    '1.0.0+a.b.c': ((1, 0, 0, 'a', '.', 'b', '.', 'c'), {}),
     '1.0.0.4': ((1, 0, 0, '.', None, 4), {}),
     '2.0.0.8+cc81cee': ((2, 0, 0, '.', None, 8, 'cc81cee'), {}),
     '4.5.0.dev1234': ((4, 5, 0, '.', 'dev', 1234), {}),
@@ -139,12 +141,17 @@ INCOMPATIBLE_STR_CASES: t.Dict[str, t.Tuple[tuple, dict]] = {
     '1.0.0-0.2': ((1, 0, 0, '-', None, 0, '.', None, 2), {}),
     '4.5.0.dev': ((4, 5, 0, '.', 'dev', None), {})}
 
-STR_CASES = dict(itertools.chain(COMPATIBLE_STR_CASES.items(),
-                                 INCOMPATIBLE_STR_CASES.items()))
+assert not COMPATIBLE_STR_CASES.keys() & INCOMPATIBLE_STR_CASES.keys()
+
+STR_CASES = {**COMPATIBLE_STR_CASES, **INCOMPATIBLE_STR_CASES}
 
 BAD_STR_CASES = {
     '-1.0.0': ValueError,
-    '1.0.0.ekhm_what': ValueError}
+    '1.0.0.ekhm_what': ValueError,
+    'v1.0.0': ValueError,
+    '1.0.0 ': ValueError,
+    '': ValueError,
+    '1.0.0' + 'dev' * 20 + '.': ValueError}
 
 
 def case_to_version_tuple(args, kwargs):
@@ -152,8 +159,12 @@ def case_to_version_tuple(args, kwargs):
 
     To be converted are args and kwargs meant for Version.__init__().
     """
-    return args + tuple(
-        v for _, v in sorted(kwargs.items(), key=lambda _: KWARG_NAMES.index(_[0])))
+    return args + tuple(kwargs[name] for name in KWARG_NAMES if name in kwargs)
+
+
+STR_CASES_VERSION_TUPLES = {
+    version_str: case_to_version_tuple(args, kwargs)
+    for version_str, (args, kwargs) in STR_CASES.items()}
 
 
 INCREMENT_CASES = {
@@ -226,4 +237,5 @@ COMPARISON_CASES_EQUAL = {
     '1.0.0': '1.0.0',
     '1': '1.0.0',
     '1.0': '1.0.0.0',
+    '1.0.0-1': '1.0.0-1.0',
     '1.0.0-0.0.DEV42': '1.0.0.0.0.dev42'}
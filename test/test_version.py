@@ -1,6 +1,8 @@
 """Tests of version string parsing, generation and comparison."""
 
 import logging
+import os
+import typing as t
 import unittest
 
 import packaging.version
@@ -9,52 +11,134 @@ import semver
 
 from version_query.version import VersionComponent, Version
 from .examples import \
-    INIT_CASES, BAD_INIT_CASES, COMPATIBLE_STR_CASES, STR_CASES, case_to_version_tuple, \
-    INCREMENT_CASES, DEVEL_INCREMENT_CASES, COMPARISON_CASES_LESS, COMPARISON_CASES_EQUAL
+    INIT_CASES, BAD_INIT_CASES, COMPATIBLE_STR_CASES, STR_CASES, STR_CASES_VERSION_TUPLES, \
+    BAD_STR_CASES, INCREMENT_CASES, DEVEL_INCREMENT_CASES, COMPARISON_CASES_LESS, \
+    COMPARISON_CASES_EQUAL
 
 _LOG = logging.getLogger(__name__)
 
+_FAST_TESTS = os.environ.get('VQ_FAST_TESTS') == '1'
+
+
+def _try_parse(parser: t.Callable[[str], t.Any], version_str: str) -> t.Any:
+    try:
+        return parser(version_str)
+    except ValueError:
+        return None
+
+
+_THIRD_PARTY_PARSED = {
+    version_str: {
+        'packaging': _try_parse(pkg_resources.parse_version, version_str),
+        'semver': _try_parse(semver.parse, version_str),
+        'semver_info': _try_parse(semver.parse_version_info, version_str)}
+    for version_str in STR_CASES}
+
+
+class _FailureCollector:
+
+    """Context that records a failed assertion instead of propagating it."""
+
+    def __init__(self, failures: t.List[str], params: dict):
+        self._failures = failures
+        self._params = params
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None or not issubclass(exc_type, AssertionError):
+            return False
+        self._failures.append(f'{self._params}: {exc_value}')
+        return True
+
 
 class Tests(unittest.TestCase):
 
     maxDiff = None
 
+    def setUp(self):
+        self._failures: t.List[str] = []
+
+    def tearDown(self):
+        if self._failures:
+            self.fail('{} failing cases:\n{}'.format(
+                len(self._failures), '\n'.join(self._failures)))
+
+    def _sub_test(self, **params):
+        """Enter a subTest, or a failure-collecting context if VQ_FAST_TESTS is set to 1.
+
+        In the fast mode, failures of all cases are reported together after the test.
+        """
+        if _FAST_TESTS:
+            return _FailureCollector(self._failures, params)
+        return self.subTest(**params)
+
     def test_from_str(self):
-        for version_str, (args, kwargs) in STR_CASES.items():
-            version_tuple = case_to_version_tuple(args, kwargs)
-            with self.subTest(version_str=version_str, version_tuple=version_tuple):
-
-                py_version = \
-                    pkg_resources.parse_version(version_str)  # type: packaging.version.Version
-                _LOG.debug('packaging parsed version string %s into %s: %s',
-                           repr(version_str), type(py_version), py_version)
-
-                try:
-                    sem_version = semver.parse(version_str)  # type: dict
-                    _LOG.debug('semver parsed version string %s into %s: %s',
-                               repr(version_str), type(sem_version), sem_version)
-                    sem_version_info = \
-                        semver.parse_version_info(version_str)  # type: semver.VersionInfo
-                    _LOG.debug('semver parsed version string %s into %s: %s',
-                               repr(version_str), type(sem_version_info), sem_version_info)
-                except ValueError:
-                    _LOG.debug('semver could not parse version string %s', repr(version_str))
+        for version_str, version_tuple in STR_CASES_VERSION_TUPLES.items():
+            with self._sub_test(version_str=version_str, version_tuple=version_tuple):
+                for name, parsed in _THIRD_PARTY_PARSED[version_str].items():
+                    if parsed is None:
+                        _LOG.debug('%s could not parse version string %s',
+                                   name, repr(version_str))
+                    else:
+                        _LOG.debug('%s parsed version string %s into %s: %s',
+                                   name, repr(version_str), type(parsed), parsed)
 
                 self.assertEqual(Version.from_str(version_str).to_tuple(), version_tuple)
 
+    def test_from_str_cached(self):
+        version = Version.from_str('1.0.0.dev1')
+        version.increment(VersionComponent.DevPatch)
+        self.assertEqual(version.to_str(), '1.0.0.dev2')
+        self.assertEqual(Version.from_str('1.0.0.dev1').to_str(), '1.0.0.dev1')
+        self.assertIsNot(Version.from_str('1.0.0.dev1'), Version.from_str('1.0.0.dev1'))
+
+    def test_clear_cache(self):
+        Version.from_str('1.0.0.dev1')
+        Version.clear_cache()
+        self.assertEqual(Version._parse_version_str.cache_info().currsize, 0)
+        self.assertEqual(Version.from_str('1.0.0.dev1').to_str(), '1.0.0.dev1')
+
     def test_from_str_bad(self):
         with self.assertRaises(ValueError):
             Version.from_str('hello world')
+        with self.assertRaises(TypeError):
+            Version.from_str(b'1.0')
+        with self.assertRaises(TypeError):
+            Version.from_str(None)
+        for version_str, exception in BAD_STR_CASES.items():
+            with self._sub_test(version_str=version_str, exception=exception):
+                with self.assertRaises(exception):
+                    Version.from_str(version_str)
+
+    def test_parse_pre_release_str_bad(self):
+        for pre_release_str in ('', '.a..b', '.a!', '!.a', '..1'):
+            with self._sub_test(pre_release_str=pre_release_str):
+                with self.assertRaises(ValueError):
+                    Version._parse_pre_release_str(pre_release_str)
 
     def test_to_str(self):
         for result, (args, kwargs) in STR_CASES.items():
-            with self.subTest(args=args, kwargs=kwargs, result=result):
+            with self._sub_test(args=args, kwargs=kwargs, result=result):
                 self.assertEqual(Version(*args, **kwargs).to_str(), result)
 
+    def test_to_str_after_change(self):
+        version = Version.from_str('1.0.0')
+        self.assertEqual(version.to_str(), '1.0.0')
+        version.increment(VersionComponent.Patch)
+        self.assertEqual(version.to_str(), '1.0.1')
+        version.local = ('abc',)
+        self.assertEqual(version.to_str(), '1.0.1+abc')
+        version.increment(VersionComponent.DevPatch)
+        self.assertEqual(version.to_str(), '1.0.1.dev1+abc')
+        version.release = 2, 0, None
+        self.assertEqual(str(version), '2.0.dev1+abc')
+
     def test_from_py_version(self):
-        for version_str, (args, kwargs) in COMPATIBLE_STR_CASES.items():
-            version_tuple = case_to_version_tuple(args, kwargs)
-            with self.subTest(version_str=version_str, version_tuple=version_tuple):
+        for version_str in COMPATIBLE_STR_CASES:
+            version_tuple = STR_CASES_VERSION_TUPLES[version_str]
+            with self._sub_test(version_str=version_str, version_tuple=version_tuple):
                 py_version = packaging.version.Version(version_str)
                 self.assertEqual(Version.from_py_version(py_version).to_tuple(),
                                  version_tuple, py_version)
@@ -63,9 +147,9 @@ class Tests(unittest.TestCase):
                                  version_tuple, py_version_setuptools)
 
     def test_to_py_version(self):
-        for version_str, (args, kwargs) in COMPATIBLE_STR_CASES.items():
-            version_tuple = case_to_version_tuple(args, kwargs)
-            with self.subTest(version_str=version_str, version_tuple=version_tuple):
+        for version_str in COMPATIBLE_STR_CASES:
+            version_tuple = STR_CASES_VERSION_TUPLES[version_str]
+            with self._sub_test(version_str=version_str, version_tuple=version_tuple):
                 version = Version.from_str(version_str)
                 py_version = packaging.version.Version(version_str)
                 self.assertEqual(version.to_py_version(), py_version,
@@ -73,38 +157,41 @@ class Tests(unittest.TestCase):
                 # py_version_setuptools = pkg_resources.parse_version(version_str)
 
     def test_from_sem_version(self):
-        for version_str, (args, kwargs) in COMPATIBLE_STR_CASES.items():
-            version_tuple = case_to_version_tuple(args, kwargs)
-            with self.subTest(version_str=version_str, version_tuple=version_tuple):
-                try:
-                    sem_version = semver.parse(version_str)
-                except ValueError:
-                    pass
-                else:
+        for version_str in COMPATIBLE_STR_CASES:
+            version_tuple = STR_CASES_VERSION_TUPLES[version_str]
+            with self._sub_test(version_str=version_str, version_tuple=version_tuple):
+                sem_version = _THIRD_PARTY_PARSED[version_str]['semver']
+                if sem_version is not None:
                     self.assertEqual(Version.from_sem_version(sem_version).to_tuple(),
                                      version_tuple, sem_version)
-                try:
-                    sem_version_info = semver.parse_version_info(version_str)
-                except ValueError:
-                    pass
-                else:
+                sem_version_info = _THIRD_PARTY_PARSED[version_str]['semver_info']
+                if sem_version_info is not None:
                     self.assertEqual(Version.from_sem_version(sem_version_info).to_tuple(),
                                      version_tuple, sem_version_info)
 
     def test_to_sem_version(self):
-        for version_str, (args, kwargs) in COMPATIBLE_STR_CASES.items():
-            version_tuple = case_to_version_tuple(args, kwargs)
-            with self.subTest(version_str=version_str, version_tuple=version_tuple):
-                try:
-                    sem_version = semver.parse(version_str)
-                except ValueError:
-                    continue
+        for version_str in COMPATIBLE_STR_CASES:
+            version_tuple = STR_CASES_VERSION_TUPLES[version_str]
+            with self._sub_test(version_str=version_str, version_tuple=version_tuple):
+                sem_version = _THIRD_PARTY_PARSED[version_str]['semver']
                 version = Version.from_str(version_str)
+                if sem_version is None:
+                    with self.assertRaises(ValueError):
+                        version.to_sem_version()
+                    continue
                 self.assertEqual(version.to_sem_version(), sem_version)
 
+    def test_to_sem_version_bad(self):
+        for version_str in ('1', '1.0', '1.0.0.dev1', '1.0.0a1'):
+            with self._sub_test(version_str=version_str):
+                with self.assertRaises(ValueError):
+                    semver.parse(version_str)
+                with self.assertRaises(ValueError):
+                    Version.from_str(version_str).to_sem_version()
+
     def test_from_version(self):
         for version_str, (args, kwargs) in INIT_CASES.items():
-            with self.subTest(args=args, kwargs=kwargs, version_str=version_str):
+            with self._sub_test(args=args, kwargs=kwargs, version_str=version_str):
                 version = Version.from_str(version_str)
                 created_version = Version(*args, **dict(kwargs))
                 self.assertIsInstance(created_version, Version)
@@ -113,9 +200,21 @@ class Tests(unittest.TestCase):
                 self.assertEqual(version, version_copy)
                 self.assertEqual(version_copy, created_version)
 
+    def test_from_version_independent(self):
+        version = Version.from_str('1.0.0.dev1')
+        version_copy = Version.from_version(version)
+        version_copy.increment(VersionComponent.DevPatch)
+        self.assertEqual(version.to_str(), '1.0.0.dev1')
+        self.assertEqual(version_copy.to_str(), '1.0.0.dev2')
+        version = Version(1, 0, 0, pre_release=(('.', 'dev', 1),))
+        version_copy = Version.from_version(version)
+        self.assertEqual(version_copy, version)
+        version_copy.increment(VersionComponent.DevPatch)
+        self.assertEqual(version.to_str(), '1.0.0.dev1')
+
     def test_init(self):
         for version_str, (args, kwargs) in INIT_CASES.items():
-            with self.subTest(args=args, kwargs=kwargs, version_str=version_str):
+            with self._sub_test(args=args, kwargs=kwargs, version_str=version_str):
                 version = Version(*args, **dict(kwargs))
                 self.assertIsInstance(version, Version)
                 self.assertEqual(Version.from_str(version_str), version)
@@ -124,10 +223,11 @@ class Tests(unittest.TestCase):
                     self.assertIsInstance(version.pre_release, list)
                 if version.has_local:
                     self.assertIsInstance(version.local, tuple)
+                self.assertEqual(Version.from_dict(version.to_dict()), version)
 
     def test_init_bad(self):
         for (args, kwargs), exception in BAD_INIT_CASES.items():
-            with self.subTest(args=args, kwargs=kwargs, exception=exception):
+            with self._sub_test(args=args, kwargs=kwargs, exception=exception):
                 with self.assertRaises(exception):
                     Version(*args, **dict(kwargs))
         version = Version(1, 0)
@@ -142,15 +242,15 @@ class Tests(unittest.TestCase):
 
     def test_increment(self):
         for (initial_version, args), result_version in INCREMENT_CASES.items():
-            with self.subTest(initial_version=initial_version, args=args,
-                              result_version=result_version):
+            with self._sub_test(initial_version=initial_version, args=args,
+                                result_version=result_version):
                 self.assertEqual(Version.from_str(initial_version).increment(*args),
                                  Version.from_str(result_version))
 
     def test_devel_increment(self):
         for (initial_version, args), result_version in DEVEL_INCREMENT_CASES.items():
-            with self.subTest(initial_version=initial_version, args=args,
-                              result_version=result_version):
+            with self._sub_test(initial_version=initial_version, args=args,
+                                result_version=result_version):
                 self.assertEqual(Version.from_str(initial_version).devel_increment(*args),
                                  Version.from_str(result_version))
 
@@ -171,7 +271,7 @@ class Tests(unittest.TestCase):
         for earlier_version, later_version in COMPARISON_CASES_LESS.items():
             earlier = Version.from_str(earlier_version)
             later = Version.from_str(later_version)
-            with self.subTest(earlier_version=earlier_version, later_version=later_version):
+            with self._sub_test(earlier_version=earlier_version, later_version=later_version):
                 self.assertLess(earlier, later)
                 self.assertLessEqual(earlier, later)
                 self.assertNotEqual(earlier, later)
@@ -182,7 +282,7 @@ class Tests(unittest.TestCase):
         for version, equivalent_version in COMPARISON_CASES_EQUAL.items():
             original = Version.from_str(version)
             equivalent = Version.from_str(equivalent_version)
-            with self.subTest(version=version, equivalent_version=equivalent_version):
+            with self._sub_test(version=version, equivalent_version=equivalent_version):
                 self.assertLessEqual(original, equivalent)
                 self.assertLessEqual(equivalent, original)
                 self.assertEqual(original, equivalent)
@@ -190,14 +290,39 @@ class Tests(unittest.TestCase):
                 self.assertGreaterEqual(original, equivalent)
                 self.assertGreaterEqual(equivalent, original)
 
+    def test_compare_after_change(self):
+        version = Version.from_str('1.0.0')
+        other = Version.from_str('1.0.1')
+        self.assertLess(version, other)
+        version.increment(VersionComponent.Patch)
+        self.assertEqual(version, other)
+        self.assertEqual(hash(version), hash(other))
+        version.local = ('abc',)
+        self.assertGreater(version, other)
+        version.pre_release = [('.', 'dev', 1)]
+        self.assertLess(version, other)
+
+    def test_compare_after_argument_change(self):
+        pre_release = [('.', 'dev', 1)]
+        version = Version(1, 0, 0, pre_release=pre_release)
+        self.assertEqual(version.to_str(), '1.0.0.dev1')
+        pre_release[0] = ('.', 'dev', 5)
+        self.assertEqual(version.to_str(), '1.0.0.dev1')
+        self.assertEqual(version, Version.from_str('1.0.0.dev1'))
+        self.assertEqual(hash(version), hash(Version.from_str('1.0.0.dev1')))
+
     def test_compare_bad(self):
         with self.assertRaises(TypeError):
             assert Version(1, 0) < '2.0'
+        with self.assertRaises(TypeError):
+            assert Version(1, 0) == '1.0'
+        with self.assertRaises(TypeError):
+            assert Version(1, 0) != '1.0'
 
     def test_hash(self):
         for version, equivalent_version in COMPARISON_CASES_EQUAL.items():
             original = Version.from_str(version)
             equivalent = Version.from_str(equivalent_version)
-            with self.subTest(version=version, equivalent_version=equivalent_version):
+            with self._sub_test(version=version, equivalent_version=equivalent_version):
                 self.assertEqual(hash(original), hash(equivalent))
                 self.assertDictEqual({original: equivalent}, {equivalent: original})
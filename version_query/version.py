@@ -2,9 +2,11 @@
 
 import collections.abc
 import enum
+import functools
 import itertools
 import logging
 import re
+import sys
 import typing as t
 
 import packaging.version
@@ -26,8 +28,7 @@ class VersionComponent(enum.IntEnum):
     Local = 1 << 6
 
 
-def _version_tuple_checker(version_tuple, flags):
-    return all([(_ is not None if flag else _ is None) for _, flag in zip(version_tuple, flags)])
+_RELEASE_COMPONENTS = (VersionComponent.Major, VersionComponent.Minor, VersionComponent.Patch)
 
 
 class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-methods
@@ -36,101 +37,113 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
     Definitions of acceptable version formats are provided in readme.
     """
 
-    _re_number = r'(?:0|[123456789][0123456789]*)'
-    # _re_sha = r'[0123456789abcdef]+'
-    _re_letters = r'(?:[abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ]+)'
+    __slots__ = ('_major', '_minor', '_patch', '_pre_release', '_local', '_str', '_sort_key')
+
+    _major: int
+    _minor: t.Optional[int]
+    _patch: t.Optional[int]
+    _pre_release: t.Optional[t.List[t.Tuple[t.Optional[str], t.Optional[str], t.Optional[int]]]]
+    _local: t.Optional[t.Tuple[str, ...]]
+    _str: t.Optional[str]
+    _sort_key: t.Optional[tuple]
+
+    _re_number = r'(?:0|[1-9][0-9]*)'
+    # _re_sha = r'[0-9a-f]+'
+    _re_letters = r'(?:[a-zA-Z]+)'
     _pattern_letters = re.compile(_re_letters)
-    _re_alphanumeric = r'(?:[0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ]+)'
+    _re_alphanumeric = r'(?:[0-9a-zA-Z]+)'
     _pattern_alphanumeric = re.compile(_re_alphanumeric)
     _re_sep = r'(?:[\.-])'
-
-    _re_release_parts = \
-        r'(?P<major>{n})(?:\.(?P<minor>{n}))?(?:\.(?P<patch>{n}))?'.format(n=_re_number)
-    _pattern_release = re.compile(_re_release_parts)
-
-    @classmethod
-    def _parse_release_str(cls, release: str) -> tuple:
-        match = cls._pattern_release.fullmatch(release)
-        assert match is not None
-        major_match = match.group('major')
-        assert major_match is not None
-        major = int(major_match)
-        minor_match = match.group('minor')
-        if minor_match is not None:
-            minor = int(minor_match)
-        else:
-            minor = None
-        patch_match = match.group('patch')
-        if patch_match is not None:
-            patch = int(patch_match)
-        else:
-            patch = None
-        return major, minor, patch
+    _separators = frozenset('.-')
 
     _re_pre_separator = rf'(?P<preseparator>{_re_sep})'
     _re_pre_type = rf'(?P<pretype>{_re_letters})'
     _re_pre_patch = rf'(?P<prepatch>{_re_number})'
-    _re_pre_release_part = rf'{_re_pre_separator}?{_re_pre_type}?{_re_pre_patch}?'
-    _pattern_pre_release_part = re.compile(_re_pre_release_part)
     _re_pre_release_parts = r'(?:{0}{2})|(?:{0}?{1}{2}?)'.format(_re_sep, _re_letters, _re_number)
-    _pattern_pre_release = re.compile(_re_pre_release_parts)
-    _pattern_pre_release_check = re.compile(rf'(?:{_re_pre_release_parts})+')
+    _pattern_pre_release = re.compile(
+        rf'(?={_re_pre_release_parts}){_re_pre_separator}?{_re_pre_type}?{_re_pre_patch}?')
 
     @classmethod
     def _parse_pre_release_str(cls, pre_release: str) -> t.Sequence[
             t.Tuple[t.Optional[str], t.Optional[str], t.Optional[int]]]:
-        parts = cls._pattern_pre_release.findall(pre_release)
-        _LOG.debug('parsed pre-release string %s into %s',
-                   repr(pre_release), parts)
         tuples = []
-        for part in parts:
-            match = cls._pattern_pre_release_part.fullmatch(part)
-            assert match is not None
-            pre_patch_match = match.group('prepatch')
-            if pre_patch_match is not None:
-                pre_patch = int(pre_patch_match)
-            else:
-                pre_patch = None
-            tuples.append((match.group('preseparator'), match.group('pretype'), pre_patch))
+        position = 0
+        for match in cls._pattern_pre_release.finditer(pre_release):
+            # segments must cover the whole string, which makes a separate validating pattern
+            # unnecessary
+            if match.start() != position:
+                break
+            position = match.end()
+            pre_separator, pre_type, pre_patch = match.group(
+                'preseparator', 'pretype', 'prepatch')
+            tuples.append((pre_separator, None if pre_type is None else sys.intern(pre_type),
+                           None if pre_patch is None else int(pre_patch)))
+        if position == 0 or position != len(pre_release):
+            raise ValueError(f'pre-release string {repr(pre_release)} is invalid')
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug('parsed pre-release string %s into %s', repr(pre_release), tuples)
         return tuples
 
-    _re_local_separator = rf'({_re_sep})'
-    _re_local_part = rf'({_re_alphanumeric})'
-    _re_local_parts = rf'\+{_re_local_part}(?:{_re_local_separator}{_re_local_part})*'
-    _pattern_local = re.compile(_re_local_parts)
+    _pattern_local_separator = re.compile(rf'({_re_sep})')
 
     @classmethod
     def _parse_local_str(cls, local: str) -> tuple:
-        match = cls._pattern_local.fullmatch(local)
-        assert match is not None
-        return tuple([_ for _ in match.groups() if _ is not None])
+        assert local.startswith('+'), local
+        return tuple(map(sys.intern, cls._pattern_local_separator.split(local[1:])))
 
-    _re_release = r'(?P<release>{n}(?:\.{n})?(?:\.{n})?)'.format(n=_re_number)
-    _re_pre_release = r'(?P<prerelease>(?:(?:{0}{2})|(?:{0}?{1}{2}?))+)'.format(
+    _re_release = r'(?P<major>{n})(?:\.(?P<minor>{n}))?(?:\.(?P<patch>{n}))?'.format(n=_re_number)
+    # a run of letters is never split between segments, which emulates a possessive quantifier
+    # and avoids exponential backtracking when a long pre-release string does not match
+    _re_pre_release = r'(?P<prerelease>(?:(?:{0}{2})|(?:{0}?{1}(?![a-zA-Z]){2}?))+)'.format(
         _re_sep, _re_letters, _re_number)
     _re_local = r'(?P<local>\+{0}([\.-]{0})*)'.format(_re_alphanumeric)
     # _re_named_parts_count = 3 + 3
     _re_version = rf'{_re_release}{_re_pre_release}?{_re_local}?'
-    _pattern_version = re.compile(_re_version)
+    _pattern_version = re.compile(_re_version, re.ASCII)
+    _version_chars = frozenset('0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ.-+')
 
     @classmethod
-    def from_str(cls, version_str: str):
-        """Create version from string."""
+    @functools.lru_cache(maxsize=4096)
+    def _parse_version_str(cls, version_str: str) -> tuple:
+        """Parse version string into a tuple of immutable version components.
+
+        Results are cached, because the same version strings tend to be parsed repeatedly.
+        """
+        if not isinstance(version_str, str):
+            raise TypeError(f'version_str={repr(version_str)} is of wrong type {type(version_str)}')
+        # cheaply reject strings with characters that can never be part of a version
+        if not cls._version_chars.issuperset(version_str):
+            raise ValueError(f'version string {repr(version_str)} is invalid')
         match = cls._pattern_version.fullmatch(version_str)  # type: t.Optional[t.Match[str]]
         if match is None:
             raise ValueError(f'version string {repr(version_str)} is invalid')
-        _LOG.debug('version_query parsed version string %s into %s: %s %s',
-                   repr(version_str), type(match), match.groupdict(), match.groups())
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug('version_query parsed version string %s into %s: %s %s',
+                       repr(version_str), type(match), match.groupdict(), match.groups())
+
+        _major, _minor, _patch, _pre_release, _local = match.group(
+            'major', 'minor', 'patch', 'prerelease', 'local')
+
+        major = int(_major)
+        minor = None if _minor is None else int(_minor)
+        patch = None if _patch is None else int(_patch)
+        pre_release = None if _pre_release is None \
+            else tuple(cls._parse_pre_release_str(_pre_release))
+        local = None if _local is None else cls._parse_local_str(_local)
 
-        _release = match.group('release')
-        _pre_release = match.group('prerelease')
-        _local = match.group('local')
+        return major, minor, patch, pre_release, local
 
-        major, minor, patch = cls._parse_release_str(_release)
-        pre_release = None if _pre_release is None else cls._parse_pre_release_str(_pre_release)
-        local = None if _local is None else cls._parse_local_str(_local)
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Forget all cached results of parsing version strings."""
+        cls._parse_version_str.cache_clear()
 
-        return cls(major=major, minor=minor, patch=patch, pre_release=pre_release, local=local)
+    @classmethod
+    def from_str(cls, version_str: str):
+        """Create version from string."""
+        major, minor, patch, pre_release, local = cls._parse_version_str(version_str)
+        return cls._from_validated_parts(
+            major, minor, patch, None if pre_release is None else list(pre_release), local)
 
     @classmethod
     def from_tuple(cls, version_tuple: tuple):
@@ -142,13 +155,17 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
 
     @classmethod
     def from_py_version(cls, py_version: packaging.version.Version):
-        """Create version from a standard Python version object."""
-        if not isinstance(py_version, packaging.version.Version):
+        """Create version from a standard Python version object.
+
+        Components of a genuine packaging version are always valid, so they are not validated.
+        """
+        is_py_version = isinstance(py_version, packaging.version.Version)
+        if not is_py_version:
             _LOG.warning('attempting to parse %s as packaging.version.Version...', type(py_version))
         ver = py_version._version
         major, minor, patch = [ver.release[i] if len(ver.release) > i
                                else None for i in range(3)]
-        pre_release: t.Optional[t.Sequence[
+        pre_release: t.Optional[t.List[
             t.Tuple[t.Optional[str], t.Optional[str], t.Optional[int]]]] = None
         local = None
         pre_ver: t.Optional[t.Tuple[None, int]]
@@ -158,7 +175,7 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
             raise NotImplementedError(py_version)
         else:
             pre_ver = None
-        pre_ver_present = sum(1 for _ in (ver.post, ver.dev, ver.pre) if _)
+        pre_ver_present = bool(ver.post) + bool(ver.dev) + bool(ver.pre)
         if pre_ver and pre_ver_present:
             raise NotImplementedError(py_version)
         if pre_ver_present > 1:
@@ -173,13 +190,18 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
         if ver.local:
             local = tuple(itertools.chain.from_iterable(
                 (dot, str(_)) for dot, _ in zip('.' * len(ver.local), ver.local)))[1:]
-        _LOG.debug('parsing %s %s', type(py_version), py_version)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug('parsing %s %s', type(py_version), py_version)
+        if is_py_version:
+            assert major is not None, py_version
+            return cls._from_validated_parts(major, minor, patch, pre_release, local)
         return cls(major, minor, patch, pre_release=pre_release, local=local)
 
     @classmethod
     def from_sem_version(cls, sem_version: t.Union[dict, semver.VersionInfo]):
         """Create version from semantic version object."""
-        _LOG.debug('parsing %s %s', type(sem_version), sem_version)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug('parsing %s %s', type(sem_version), sem_version)
         if isinstance(sem_version, semver.VersionInfo):
             major, minor, patch = sem_version.major, sem_version.minor, sem_version.patch
             pre_release = sem_version.prerelease
@@ -196,25 +218,35 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
 
     @classmethod
     def from_version(cls, version: 'Version'):
-        return cls.from_dict(version.to_dict())
+        return cls._from_validated_parts(
+            version._major, version._minor, version._patch, version.pre_release, version._local)
+
+    @classmethod
+    def _from_validated_parts(
+            cls, major: int, minor: t.Optional[int], patch: t.Optional[int],
+            pre_release: t.Optional[
+                t.List[t.Tuple[t.Optional[str], t.Optional[str], t.Optional[int]]]],
+            local: t.Optional[t.Tuple[str, ...]]) -> 'Version':
+        """Create version from components that are known to be valid, skipping validation."""
+        version = cls.__new__(cls)
+        version._major = major
+        version._minor = minor
+        version._patch = patch
+        version._pre_release = pre_release
+        version._local = local
+        version._reset_cached_values()
+        return version
 
     def __init__(
             self, major: int, minor: t.Optional[int] = None, patch: t.Optional[int] = None, *args,
             pre_release: t.Sequence[
                 t.Tuple[t.Optional[str], t.Optional[str], t.Optional[int]]] = None,
             local: t.Union[str, tuple] = None):
-        self._major: t.Optional[int] = None
-        self._minor: t.Optional[int] = None
-        self._patch: t.Optional[int] = None
-        self._pre_release: t.Optional[
-            t.List[t.Tuple[t.Optional[str], t.Optional[str], t.Optional[int]]]] = None
-        self._local: t.Optional[t.Sequence[str]] = None
-
         self.release = major, minor, patch
 
         if args and pre_release is not None and local is not None:
             raise ValueError(f'args={args}, pre_release={pre_release} and local={local}'
-                             f' are all present in {repr(self)}')
+                             f' are all present for release={(major, minor, patch)}')
 
         if pre_release is None:
             pre_release, consumed_args = self._get_pre_release_from_args(args)
@@ -226,7 +258,7 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
 
         if args and local is not None:
             raise ValueError(f'args={args} and local={local} are present at the same time'
-                             f' in {repr(self)}')
+                             f' for release={(major, minor, patch)}')
 
         if local is None:
             if len(args) == 1 and isinstance(args[0], tuple):
@@ -247,31 +279,39 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
             for i, arg in enumerate(args):
                 if not isinstance(arg, tuple):
                     break
-                if len(arg) == 3 and arg[0] in (None, '.', '-'):
+                if len(arg) == 3 and (arg[0] is None or arg[0] == '.' or arg[0] == '-'):
                     pre_release.append(arg)
                     consumed_args += 1
                     continue
                 if i == len(args) - 1:
                     break
-                raise ValueError(f'pre-release segment arg={arg} (index {i} in args={args}'
-                                 f' in {repr(self)}) must be a 3-tuple')
+                raise ValueError(f'pre-release segment arg={arg} (index {i} in args={args})'
+                                 f' must be a 3-tuple')
         else:
-            accumulated: t.List[t.Union[int, str]] = []
-            for i, arg in enumerate(args):
-                if not accumulated:
-                    if arg in (None, '.', '-'):
-                        if len(args) < i + 3:
-                            raise ValueError(f'expected 3 consecutive values from index {i}'
-                                             f' in args={args} in {repr(self)}')
-                    else:
-                        break
-                accumulated.append(arg)
-                consumed_args += 1
-                if len(accumulated) == 3:
-                    pre_release.append(tuple(accumulated))
-                    accumulated = []
+            # flat args hold consecutive (separator, type, patch) triples, followed by local parts
+            i = 0
+            while i < len(args) and (args[i] is None or args[i] == '.' or args[i] == '-'):
+                if len(args) < i + 3:
+                    raise ValueError(f'expected 3 consecutive values from index {i}'
+                                     f' in args={args}')
+                pre_release.append(args[i:i + 3])
+                i += 3
+            consumed_args = i
         return pre_release, consumed_args
 
+    def _wrong_type(self, name: str, value: t.Any) -> TypeError:
+        """Create error about a version component that is of wrong type."""
+        return TypeError(f'{name}={repr(value)} is of wrong type {type(value)} in {repr(self)}')
+
+    def _wrong_value(self, name: str, value: t.Any, reason: str = 'has wrong value') -> ValueError:
+        """Create error about a version component that has wrong value."""
+        return ValueError(f'{name}={repr(value)} {reason} in {repr(self)}')
+
+    def _reset_cached_values(self) -> None:
+        """Forget values derived from version components, after any of them changes."""
+        self._str = None
+        self._sort_key = None
+
     @property
     def release(self) -> t.Tuple[int, t.Optional[int], t.Optional[int]]:
         assert self._major is not None
@@ -281,36 +321,35 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
     def release(self, release: t.Tuple[int, t.Optional[int], t.Optional[int]]):
         # major: int, minor: t.Optional[int] = None, patch: t.Optional[int] = None):
         if not isinstance(release, tuple):
-            raise TypeError(
-                f'release={repr(release)} is of wrong type {type(release)} in {repr(self)}')
+            raise self._wrong_type('release', release)
         if len(release) != 3:
-            raise ValueError(
-                f'release={repr(release)} has wrong length {len(release)} in {repr(self)}')
+            raise self._wrong_value('release', release, f'has wrong length {len(release)}')
 
         major, minor, patch = release
 
         if not isinstance(major, int):
-            raise TypeError(f'major={repr(major)} is of wrong type {type(major)} in {repr(self)}')
+            raise self._wrong_type('major', major)
         if major < 0:
-            raise ValueError(f'major={repr(major)} has wrong value in {repr(self)}')
+            raise self._wrong_value('major', major)
         if minor is not None and not isinstance(minor, int):
-            raise TypeError(f'minor={repr(minor)} is of wrong type {type(minor)} in {repr(self)}')
+            raise self._wrong_type('minor', minor)
         if minor is not None and minor < 0:
-            raise ValueError(f'minor={repr(minor)} has wrong value in {repr(self)}')
+            raise self._wrong_value('minor', minor)
         if patch is not None and not isinstance(patch, int):
-            raise TypeError(f'patch={repr(patch)} is of wrong type {type(patch)} in {repr(self)}')
+            raise self._wrong_type('patch', patch)
         if patch is not None and patch < 0:
-            raise ValueError(f'patch={repr(patch)} has wrong value in {repr(self)}')
+            raise self._wrong_value('patch', patch)
         if minor is None and patch is not None:
-            raise ValueError(f'patch={repr(patch)} is present but not minor in {repr(self)}')
+            raise self._wrong_value('patch', patch, 'is present but not minor')
 
         self._major = major
         self._minor = minor
         self._patch = patch
+        self._reset_cached_values()
 
     @property
     def pre_release(self) -> t.Optional[
-            t.Sequence[t.Tuple[t.Optional[str], t.Optional[str], t.Optional[int]]]]:
+            t.List[t.Tuple[t.Optional[str], t.Optional[str], t.Optional[int]]]]:
         """Pre-release version component."""
         if self._pre_release is None:
             return None
@@ -322,49 +361,45 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
                 t.List[t.Tuple[t.Optional[str], t.Optional[str], t.Optional[int]]]]):
         if pre_release is None:
             self._pre_release = None
+            self._reset_cached_values()
             return
 
         if not isinstance(pre_release, collections.abc.Sequence):
-            raise TypeError(f'pre_release={repr(pre_release)} is of wrong type {type(pre_release)}'
-                            f' in {repr(self)}')
+            raise self._wrong_type('pre_release', pre_release)
         if len(pre_release) == 0:
-            raise ValueError(f'pre_release has no elements although it is set in {repr(self)}')
+            raise self._wrong_value('pre_release', pre_release, 'has no elements')
 
         for pre in pre_release:
             if not isinstance(pre, tuple):
-                raise TypeError(
-                    f'pre-release part {repr(pre)} is of wrong type {type(pre)} in {repr(self)}')
+                raise self._wrong_type('pre-release part', pre)
             if len(pre) != 3:
-                raise ValueError(
-                    f'pre-release part={repr(pre)} has wrong length {len(pre)} in {repr(self)}')
+                raise self._wrong_value('pre-release part', pre, f'has wrong length {len(pre)}')
             pre_separator, pre_type, pre_patch = pre
             self._check_pre_release_parts(pre_separator, pre_type, pre_patch)
 
-        self._pre_release = pre_release
+        self._pre_release = list(pre_release)
+        self._reset_cached_values()
 
     def _check_pre_release_parts(self, pre_separator, pre_type, pre_patch):
         """Verify that the given pre-release version identifier parts are valid."""
         if pre_separator is not None and not isinstance(pre_separator, str):
-            raise TypeError(f'pre_separator={repr(pre_separator)} is of wrong type'
-                            f' {type(pre_separator)} in {repr(self)}')
-        if pre_separator is not None and pre_separator not in ('-', '.'):
-            raise ValueError(f'pre_separator={repr(pre_separator)} has wrong value in {repr(self)}')
+            raise self._wrong_type('pre_separator', pre_separator)
+        if pre_separator is not None and pre_separator not in self._separators:
+            raise self._wrong_value('pre_separator', pre_separator)
         if pre_type is not None and not isinstance(pre_type, str):
-            raise TypeError(
-                f'pre_type={repr(pre_type)} is of wrong type {type(pre_type)} in {repr(self)}')
-        if pre_type is not None and type(self)._pattern_letters.fullmatch(pre_type) is None:
-            raise ValueError(f'pre_type={repr(pre_type)} has wrong value in {repr(self)}')
+            raise self._wrong_type('pre_type', pre_type)
+        if pre_type is not None and self._pattern_letters.fullmatch(pre_type) is None:
+            raise self._wrong_value('pre_type', pre_type)
         if pre_patch is not None and not isinstance(pre_patch, int):
-            raise TypeError(
-                f'pre_patch={repr(pre_patch)} is of wrong type {type(pre_patch)} in {repr(self)}')
+            raise self._wrong_type('pre_patch', pre_patch)
         if pre_patch is not None and pre_patch < 0:
-            raise ValueError(f'pre_patch={repr(pre_patch)} has wrong value in {repr(self)}')
+            raise self._wrong_value('pre_patch', pre_patch)
         if pre_separator is None and pre_type is None and pre_patch is not None:
-            raise ValueError(f'neither pre_separator nor pre_type is set'
-                             f' but pre_patch={repr(pre_patch)} is in {repr(self)}')
+            raise self._wrong_value(
+                'pre_patch', pre_patch, 'is present but neither pre_separator nor pre_type is')
         if pre_separator is not None and pre_type is None and pre_patch is None:
-            raise ValueError(f'pre_separator={repr(pre_separator)} is present'
-                             f' but neither pre_type nor pre_patch is in {repr(self)}')
+            raise self._wrong_value(
+                'pre_separator', pre_separator, 'is present but neither pre_type nor pre_patch is')
 
     @property
     def has_pre_release(self):
@@ -378,25 +413,26 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
     def local(self, local: t.Optional[t.Sequence[str]]):
         if local is None:
             self._local = None
+            self._reset_cached_values()
             return
 
         if not isinstance(local, collections.abc.Sequence):
-            raise TypeError(f'local={repr(local)} is of wrong type {type(local)} in {repr(self)}')
+            raise self._wrong_type('local', local)
 
         if len(local) % 2 != 1:
-            raise ValueError(f'local={repr(local)} has wrong length {len(local)} in {repr(self)}')
+            raise self._wrong_value('local', local, f'has wrong length {len(local)}')
 
         for i, part in enumerate(local):
             if not isinstance(part, str):
-                raise TypeError(f'local_part or local_separator {repr(part)} is of wrong type'
-                                f' {type(part)} in {repr(self)}')
+                raise self._wrong_type('local_part or local_separator', part)
             if i % 2 == 0:
-                if type(self)._pattern_alphanumeric.fullmatch(part) is None:
-                    raise ValueError(f'local_part={repr(part)} has wrong value in {repr(self)}')
-            elif part not in ('-', '.'):
-                raise ValueError(f'local_separator={repr(part)} has wrong value in {repr(self)}')
+                if self._pattern_alphanumeric.fullmatch(part) is None:
+                    raise self._wrong_value('local_part', part)
+            elif part not in self._separators:
+                raise self._wrong_value('local_separator', part)
 
-        self._local = tuple(local)
+        self._local = local if isinstance(local, tuple) else tuple(local)
+        self._reset_cached_values()
 
     @property
     def has_local(self):
@@ -411,7 +447,7 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
         if amount < 1:
             raise ValueError(f'amount={amount} has wrong value')
 
-        if component in (VersionComponent.Major, VersionComponent.Minor, VersionComponent.Patch):
+        if component in _RELEASE_COMPONENTS:
             self._increment_release(component, amount)
 
         elif component is VersionComponent.PrePatch:
@@ -432,10 +468,11 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
         else:
             raise ValueError(f'incrementing component={repr(component)} is not possible')
 
+        self._reset_cached_values()
         return self
 
     def _increment_release(self, component: VersionComponent, amount: int):
-        if component in (VersionComponent.Major, VersionComponent.Minor):
+        if component is not VersionComponent.Patch:
             if component is VersionComponent.Major:
                 assert self._major is not None
                 self._major += amount
@@ -486,44 +523,46 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
 
     def release_to_str(self) -> str:
         """Get string representation of this version's release component."""
-        version_tuple = self._major, self._minor, self._patch
-        if _version_tuple_checker(version_tuple, (True, False, False)):
-            return '.'.join(str(_) for _ in version_tuple[:1])
-        if _version_tuple_checker(version_tuple, (True, True, False)):
-            return '.'.join(str(_) for _ in version_tuple[:2])
-        if _version_tuple_checker(version_tuple, (True, True, True)):
-            return '.'.join(str(_) for _ in version_tuple[:3])
+        major, minor, patch = self._major, self._minor, self._patch
+        if major is not None:
+            if minor is None and patch is None:
+                return str(major)
+            if minor is not None:
+                return f'{major}.{minor}' if patch is None else f'{major}.{minor}.{patch}'
         raise ValueError(f'cannot generate valid version string from {repr(self)}')
 
     def _pre_release_segment_to_str(self, segment: int) -> str:
         assert self._pre_release is not None
-        version_tuple = self._pre_release[segment]
-        if _version_tuple_checker(version_tuple, (True, True, False)):
-            return '{}{}'.format(*version_tuple[:2])
-        if _version_tuple_checker(version_tuple, (True, False, True)):
-            return f'{version_tuple[0]}{version_tuple[2]}'
-        if _version_tuple_checker(version_tuple, (True, True, True)):
-            return '{}{}{}'.format(*version_tuple)
+        pre_separator, pre_type, pre_patch = self._pre_release[segment]
+        if pre_separator is not None:
+            if pre_type is not None:
+                return f'{pre_separator}{pre_type}' if pre_patch is None \
+                    else f'{pre_separator}{pre_type}{pre_patch}'
+            if pre_patch is not None:
+                return f'{pre_separator}{pre_patch}'
         raise ValueError(f'cannot generate valid version string from {repr(self)}')
 
     def pre_release_to_str(self) -> str:
         if self._pre_release is None:
             return ''
-        return ''.join(self._pre_release_segment_to_str(i)
-                       for i, _ in enumerate(self._pre_release))
+        return ''.join([self._pre_release_segment_to_str(i)
+                        for i in range(len(self._pre_release))])
 
     def local_to_str(self) -> str:
         if not self._local:
             return ''
-        return f'+{"".join(self._local)}'
+        return '+' + ''.join(self._local)
 
     def to_str(self) -> str:
-        return f'{self.release_to_str()}{self.pre_release_to_str()}{self.local_to_str()}'
+        if self._str is None:
+            self._str = f'{self.release_to_str()}{self.pre_release_to_str()}{self.local_to_str()}'
+        return self._str
 
     def release_to_tuple(self, sort: bool = False) -> tuple:
-        return (0 if sort else None) if self._major is None else self._major, \
-            (0 if sort else None) if self._minor is None else self._minor, \
-            (0 if sort else None) if self._patch is None else self._patch
+        if sort:
+            # missing components are None and present ones are non-negative, so "or 0" is exact
+            return self._major, self._minor or 0, self._patch or 0
+        return self._major, self._minor, self._patch
 
     def pre_release_segment_to_tuple(self, segment: int, sort: bool = False) -> tuple:
         assert self._pre_release is not None
@@ -539,43 +578,93 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
                 return ((1, '', 0),)
             return ()
         parts = [self.pre_release_segment_to_tuple(i, sort)
-                 for i, _ in enumerate(self._pre_release)]
+                 for i in range(len(self._pre_release))]
         return tuple(parts) if sort else tuple(itertools.chain.from_iterable(parts))
 
     def local_to_tuple(self, sort: bool = False) -> tuple:
         if self._local is None:
             return ()
-        return tuple(0 if _ in ('.', '-') else _.lower() for _ in self._local) \
+        return tuple(0 if _ in self._separators else _.lower() for _ in self._local) \
             if sort else self._local
 
     def to_tuple(self, sort: bool = False) -> tuple:
         return self.release_to_tuple(sort) + self.pre_release_to_tuple(sort) \
             + self.local_to_tuple(sort)
 
+    def _get_sort_key(self) -> tuple:
+        """Create a flat tuple that compares the same way as this version.
+
+        Pre-release components are compared as if the shorter one was padded with neutral
+        (1, '', 0) segments. For that to work as a plain tuple comparison, each run of neutral
+        segments is folded into the next segment, which is prefixed with -1, run_length
+        if it sorts before a neutral segment, or with 1, -run_length otherwise. A single 0
+        stands for the endless run of neutral segments that ends the pre-release component.
+
+        Release, pre-release and local components are laid out one after another, as release
+        has fixed length and the 0 terminator aligns the local components of any two keys.
+        """
+        if self._sort_key is not None:
+            return self._sort_key
+        neutral_segment = (1, '', 0)
+        sort_key = list(self.release_to_tuple(True))
+        neutral_run = 0
+        for segment in self.pre_release_to_tuple(True):
+            if segment == neutral_segment:
+                neutral_run += 1
+                continue
+            if segment < neutral_segment:
+                sort_key += (-1, neutral_run)
+            else:
+                sort_key += (1, -neutral_run)
+            sort_key += segment
+            neutral_run = 0
+        sort_key.append(0)
+        sort_key += self.local_to_tuple(True)
+        self._sort_key = tuple(sort_key)
+        return self._sort_key
+
     def to_dict(self) -> dict:
-        return {field[1:]: value for field, value in vars(self).items()}
+        return {'major': self._major, 'minor': self._minor, 'patch': self._patch,
+                'pre_release': self.pre_release, 'local': self._local}
 
     def to_py_version(self) -> packaging.version.Version:
         return packaging.version.Version(self.to_str())
 
     def to_sem_version(self) -> dict:
-        return semver.parse(self.to_str())
+        """Create semantic version dictionary equivalent to what semver.parse() returns.
+
+        Valid pre-release and local components always form valid semantic version identifiers,
+        so only the presence of all release components and the leading pre-release separator
+        need checking.
+        """
+        version_str = self.to_str()
+        if self._minor is None or self._patch is None \
+                or self._pre_release is not None and self._pre_release[0][0] != '-':
+            raise ValueError(f'{version_str} is not valid SemVer string')
+        return {'major': self._major, 'minor': self._minor, 'patch': self._patch,
+                'prerelease': self.pre_release_to_str()[1:] or None,
+                'build': self.local_to_str()[1:] or None}
 
     def __repr__(self):
-        fields = ', '.join(f'{field[1:]}: {repr(value)}' for field, value in vars(self).items())
+        # components are missing while an instance is still being validated in __init__
+        fields = ', '.join(f'{name[1:]}: {getattr(self, name, None)!r}' for name in (
+            '_major', '_minor', '_patch', '_pre_release', '_local'))
         return f'{type(self).__name__}({fields})'
 
     def __str__(self):
         return self.to_str()
 
     def __hash__(self):
-        return hash(self.to_tuple(sort=True))
+        # the same key is used for comparisons, so equal versions always have equal hashes
+        return hash(self._get_sort_key())
 
     def __eq__(self, other):
-        return not self < other and not other < self
+        if not isinstance(other, Version):
+            raise TypeError(f'cannot compare {type(self)} and {type(other)}')
+        return self._get_sort_key() == other._get_sort_key()
 
     def __ne__(self, other):
-        return self < other or other < self
+        return not self == other
 
     def __gt__(self, other):
         return other < self
@@ -586,28 +675,7 @@ class Version(collections.abc.Hashable):  # pylint: disable = too-many-public-me
     def __lt__(self, other):
         if not isinstance(other, Version):
             raise TypeError(f'cannot compare {type(self)} and {type(other)}')
-
-        self_release = self.release_to_tuple(True)
-        other_release = other.release_to_tuple(True)
-        if self_release != other_release:
-            return self_release < other_release
-
-        self_pre_release = self.pre_release_to_tuple(True)
-        other_pre_release = other.pre_release_to_tuple(True)
-        for self_part, other_part in itertools.zip_longest(
-                self_pre_release, other_pre_release, fillvalue=(1, '', 0)):
-            if self_part != other_part:
-                return self_part < other_part
-
-        self_local = self.local_to_tuple(True)
-        other_local = other.local_to_tuple(True)
-        for self_part, other_part in zip(self_local, other_local):
-            if self_part != other_part:
-                return self_part < other_part
-        if len(self_local) != len(other_local):
-            return len(self_local) < len(other_local)
-
-        return False
+        return self._get_sort_key() < other._get_sort_key()
 
     def __le__(self, other):
         return not other < self